@@ -3,20 +3,38 @@
 FastAPI를 사용한 데이터셋 검수 시스템
 """
 
-from fastapi import FastAPI, HTTPException, Query, UploadFile, File
+from fastapi import FastAPI, HTTPException, Header, Query, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, FileResponse
 from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from starlette.background import BackgroundTask
+from typing import List, Dict, Optional, Any, Tuple, Iterable, Iterator
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from collections import OrderedDict
+from contextlib import contextmanager
+import csv
+import hashlib
+import io
 import json
+import logging
 from datetime import datetime
 import random
 import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import quote
 from dotenv import load_dotenv
 from openai import OpenAI
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+logger = logging.getLogger(__name__)
 
 # 환경 변수 로드
 load_dotenv()
@@ -44,8 +62,16 @@ app.add_middleware(
 DATA_DIR = Path("/app/data") if Path("/app/data").exists() else Path("../../data")
 PREPROCESSED_DATA_PATH = DATA_DIR / "final" / "preprocessed_data.csv"
 LABELED_DATA_PATH = DATA_DIR / "final" / "labeled_data.csv"
+VERSIONS_DIR = DATA_DIR / "versions"  # 내용 해시로 식별되는 불변 데이터셋 버전
+INDEX_DIR = DATA_DIR / "index"  # 버전별 검색 색인, 누적 통계 등 파생 데이터
+SEGMENTS_DIR = INDEX_DIR / "segments"  # 버전 간 공유되는 검색 색인 세그먼트
+DATASET_RETENTION_COUNT = int(os.getenv("DATASET_RETENTION_COUNT", "5"))  # 보존할 최근 버전 수
+DATASET_CACHE_SIZE = 4  # 메모리에 유지할 데이터셋 버전 수
 INSPECTION_DIR = Path("/app/inspection_results") if Path("/app").exists() else Path("../../inspection_results")
 INSPECTION_DIR.mkdir(exist_ok=True, parents=True)
+INSPECTION_TABLE_DIR = INSPECTION_DIR / "inspection_table"  # 세션별 컬럼형 테이블 조각
+
+LABEL_FIELDS = ["is_ad", "is_fake"]  # 라벨링 데이터 라벨 컬럼
 
 # Pydantic 모델
 class SimilarityCheck(BaseModel):
@@ -79,48 +105,280 @@ class InspectionSession(BaseModel):
 class InspectionResult(BaseModel):
     session_id: str
     inspections: List[InspectionItem]
+    revision: Optional[int] = None  # 편집을 시작한 결과 리비전 (지정 시 충돌 검사)
+
+
+# 파일 저장 유틸리티
+# 같은 디렉터리의 임시 파일에 쓴 뒤 os.replace로 교체하여 읽는 쪽이 불완전한 파일을 보지 않도록 함
+@contextmanager
+def atomic_open(path: Path, mode: str = 'w', **kwargs):
+    """임시 파일에 기록 후 대상 경로로 원자적 교체"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2):
+    """JSON 파일 원자적 저장"""
+    with atomic_open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
 
 
 # 데이터 로딩 함수
-def load_data(data_type: str) -> pd.DataFrame:
-    """데이터 로드"""
+# 데이터셋은 내용 해시(sha256 앞 16자리)로 식별되는 불변 버전으로 관리
+# data/final/*.csv는 현재 버전의 작업 사본이며, 직접 교체된 경우 새 버전으로 자동 등록
+_current_versions: Dict[str, Dict[str, Any]] = {}
+_dataset_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+_dataset_stats_cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+# 버전 등록/업로드 직렬화 (업로드 중 get_current_version 재진입 허용)
+_dataset_write_lock = threading.RLock()
+
+
+def get_data_path(data_type: str) -> Path:
+    """데이터 유형별 파일 경로"""
     if data_type == "preprocessed":
-        path = PREPROCESSED_DATA_PATH
+        return PREPROCESSED_DATA_PATH
     elif data_type == "labeled":
-        path = LABELED_DATA_PATH
+        return LABELED_DATA_PATH
     else:
         raise ValueError(f"Invalid data type: {data_type}")
 
+
+def get_version_path(data_type: str, version: str) -> Path:
+    """버전별 데이터 파일 경로"""
+    return VERSIONS_DIR / f"{data_type}_{version}.csv"
+
+
+def get_artifact_dir(data_type: str, version: str) -> Path:
+    """버전별 파생 데이터(누적 통계, 검색 색인 목록) 경로"""
+    return INDEX_DIR / f"{data_type}_{version}"
+
+
+def get_file_signature(path: Path) -> List[int]:
+    """파일 변경 여부 판단용 (수정 시각, 크기)"""
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _file_digest(path: Path) -> str:
+    """파일 내용 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def _new_version_tmp_path() -> Path:
+    """버전 저장소 내 임시 파일 경로"""
+    VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=VERSIONS_DIR, suffix=".tmp", delete=False) as f:
+        return Path(f.name)
+
+
+def _store_version_file(data_type: str, source: Path, move: bool) -> str:
+    """파일을 버전 저장소에 보관하고 버전 해시 반환 (이미 있는 버전이면 재사용)"""
+    version = _file_digest(source)
+    version_path = get_version_path(data_type, version)
+    if version_path.exists():
+        if move:
+            source.unlink()
+        os.utime(version_path)  # 보존 정책상 최근 사용 버전으로 갱신
+        return version
+
+    VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    if move:
+        os.replace(source, version_path)
+    else:
+        tmp_path = _new_version_tmp_path()
+        try:
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, version_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    return version
+
+
+def _set_current_version(data_type: str, version: str, signature: List[int]):
+    """현재 버전 포인터 저장"""
+    VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    pointer = {"version": version, "source_signature": signature}
+    write_json_atomic(VERSIONS_DIR / f"{data_type}_current.json", pointer, indent=None)
+    _current_versions[data_type] = {"version": version, "signature": signature}
+
+
+def get_current_version(data_type: str) -> str:
+    """현재 데이터의 버전 해시"""
+    path = get_data_path(data_type)
     if not path.exists():
         raise FileNotFoundError(f"Data file not found: {path}")
 
+    signature = get_file_signature(path)
+    cached = _current_versions.get(data_type)
+    if cached and cached["signature"] == signature:
+        return cached["version"]
+
+    with _dataset_write_lock:
+        # 잠금 대기 중 다른 요청이 먼저 등록했을 수 있으므로 다시 확인
+        signature = get_file_signature(path)
+        cached = _current_versions.get(data_type)
+        if cached and cached["signature"] == signature:
+            return cached["version"]
+
+        pointer_path = VERSIONS_DIR / f"{data_type}_current.json"
+        if pointer_path.exists():
+            with open(pointer_path, 'r', encoding='utf-8') as f:
+                pointer = json.load(f)
+            if pointer["source_signature"] == signature and get_version_path(data_type, pointer["version"]).exists():
+                _current_versions[data_type] = {"version": pointer["version"], "signature": signature}
+                return pointer["version"]
+
+        # 작업 사본이 외부에서 교체됨: 새 버전으로 등록
+        version = _store_version_file(data_type, path, move=False)
+        _set_current_version(data_type, version, signature)
+        return version
+
+
+def commit_dataset_file(data_type: str, tmp_path: Path) -> str:
+    """새로 작성한 데이터 파일을 버전으로 등록하고 현재 버전으로 지정"""
+    version = _store_version_file(data_type, tmp_path, move=True)
+    activate_dataset_version(data_type, version)
+    return version
+
+
+def activate_dataset_version(data_type: str, version: str):
+    """보관된 버전을 작업 사본으로 복사하고 현재 버전 포인터 갱신"""
+    data_path = get_data_path(data_type)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, working_tmp = tempfile.mkstemp(dir=data_path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(get_version_path(data_type, version), working_tmp)
+        os.replace(working_tmp, data_path)
+    finally:
+        Path(working_tmp).unlink(missing_ok=True)
+
+    _set_current_version(data_type, version, get_file_signature(data_path))
+
+
+def _cache_dataset(data_type: str, version: str, df: pd.DataFrame, id_index: Optional[pd.Series] = None):
+    """버전별 DataFrame 캐시 (최근 사용 순으로 DATASET_CACHE_SIZE개 유지)"""
+    _dataset_cache[(data_type, version)] = {"df": df, "id_index": id_index}
+    _dataset_cache.move_to_end((data_type, version))
+    while len(_dataset_cache) > DATASET_CACHE_SIZE:
+        _dataset_cache.popitem(last=False)
+
+
+def load_data(data_type: str, version: Optional[str] = None) -> pd.DataFrame:
+    """데이터 로드 (버전 미지정 시 현재 버전, 호출 측에서 수정 금지)"""
+    version = version or get_current_version(data_type)
+    cached = _dataset_cache.get((data_type, version))
+    if cached:
+        _dataset_cache.move_to_end((data_type, version))
+        return cached["df"]
+
+    path = get_version_path(data_type, version)
+    if not path.exists():
+        raise FileNotFoundError(f"Dataset version not found: {data_type} {version}")
+
     df = pd.read_csv(path)
 
     # BOM 제거
     if df.columns[0].startswith('\ufeff'):
         df.columns = [df.columns[0].replace('\ufeff', '')] + list(df.columns[1:])
 
+    _cache_dataset(data_type, version, df)
     return df
 
 
-def calculate_quality_metrics(df: pd.DataFrame, data_type: str) -> Dict[str, Any]:
-    """데이터 품질 지표 계산"""
+def get_id_index(data_type: str, version: Optional[str] = None) -> pd.Series:
+    """id → 행 위치 인덱스 (중복 id는 마지막 행 기준)"""
+    version = version or get_current_version(data_type)
+    df = load_data(data_type, version)
+    cached = _dataset_cache[(data_type, version)]
+    if cached["id_index"] is None:
+        id_index = pd.Series(np.arange(len(df)), index=df["id"].to_numpy())
+        cached["id_index"] = id_index[~id_index.index.duplicated(keep="last")]
+    return cached["id_index"]
+
+
+def lookup_rows(data_type: str, ids, version: Optional[str] = None) -> pd.DataFrame:
+    """id 목록에 해당하는 행 조회 (요청 순서 유지, 없는 id는 제외)"""
+    version = version or get_current_version(data_type)
+    positions = get_id_index(data_type, version).reindex(ids).dropna().astype(int)
+    return load_data(data_type, version).iloc[positions.to_numpy()]
+
+
+def stats_dtype_names(dtypes: Iterable[Any]) -> List[str]:
+    """행 해시가 같은 타입끼리 같은 이름이 되도록 정규화 (Int64 → int64, boolean → bool)"""
+    names = [str(dtype) for dtype in dtypes]
+    return ["bool" if name == "boolean" else name.lower() if name.startswith("Int") else name for name in names]
+
+
+def compute_dataset_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    """품질 지표 계산용 누적 통계 (행 추가/삭제 시 더하고 빼서 갱신 가능)"""
+    hash_values, hash_counts = np.unique(
+        pd.util.hash_pandas_object(df, index=False).to_numpy(), return_counts=True
+    )
+    return {
+        "row_count": len(df),
+        "columns": list(df.columns),
+        "dtypes": stats_dtype_names(df.dtypes),
+        "missing_counts": df.isna().sum().to_numpy(dtype=np.int64),
+        "label_sums": np.array(
+            [float(df[col].sum()) if col in df.columns else 0.0 for col in LABEL_FIELDS]
+        ),
+        "hash_values": hash_values.astype(np.uint64),
+        "hash_counts": hash_counts.astype(np.int64),
+    }
+
+
+def combine_dataset_stats(stats: Dict[str, Any], delta: Dict[str, Any], sign: int = 1) -> Dict[str, Any]:
+    """누적 통계에 다른 행 집합의 통계를 더하거나(sign=1) 뺌(sign=-1)"""
+    values = np.concatenate([stats["hash_values"], delta["hash_values"]])
+    counts = np.concatenate([stats["hash_counts"], sign * delta["hash_counts"]])
+    hash_values, inverse = np.unique(values, return_inverse=True)
+    hash_counts = np.bincount(inverse, weights=counts).astype(np.int64)
+    nonzero = hash_counts > 0
+
+    return {
+        "row_count": stats["row_count"] + sign * delta["row_count"],
+        "columns": stats["columns"],
+        "dtypes": stats["dtypes"],
+        "missing_counts": stats["missing_counts"] + sign * delta["missing_counts"],
+        "label_sums": stats["label_sums"] + sign * delta["label_sums"],
+        "hash_values": hash_values[nonzero],
+        "hash_counts": hash_counts[nonzero],
+    }
+
+
+def metrics_from_stats(stats: Dict[str, Any], data_type: str) -> Dict[str, Any]:
+    """누적 통계로부터 데이터 품질 지표 계산"""
+    total = stats["row_count"]
+    columns = stats["columns"]
+    missing_counts = dict(zip(columns, stats["missing_counts"].tolist()))
     metrics = {
-        "total_records": len(df),
-        "total_columns": len(df.columns),
+        "total_records": total,
+        "total_columns": len(columns),
     }
 
     # 결측률
-    missing_rates = {}
-    for col in df.columns:
-        missing = df[col].isna().sum()
-        missing_rates[col] = round((missing / len(df)) * 100, 2)
+    missing_rates = {col: round((missing / total) * 100, 2) for col, missing in missing_counts.items()}
     metrics["missing_rates"] = missing_rates
     metrics["max_missing_rate"] = round(max(missing_rates.values()), 2)
 
-    # 중복률
-    duplicates = df.duplicated().sum()
-    metrics["duplicate_rate"] = round((duplicates / len(df)) * 100, 2)
+    # 중복률 (행 해시 기준)
+    duplicates = total - len(stats["hash_values"])
+    metrics["duplicate_rate"] = round((duplicates / total) * 100, 2)
 
     # 필수 필드 검사
     if data_type == "preprocessed":
@@ -130,27 +388,1088 @@ def calculate_quality_metrics(df: pd.DataFrame, data_type: str) -> Dict[str, Any
 
     field_coverage = {}
     for field in required_fields:
-        if field in df.columns:
-            non_empty = df[field].notna().sum()
-            field_coverage[field] = round((non_empty / len(df)) * 100, 2)
+        if field in missing_counts:
+            non_empty = total - missing_counts[field]
+            field_coverage[field] = round((non_empty / total) * 100, 2)
         else:
             field_coverage[field] = 0.0
     metrics["field_coverage"] = field_coverage
 
     # 라벨링 데이터 추가 지표
     if data_type == "labeled":
-        metrics["ad_count"] = int(df['is_ad'].sum()) if 'is_ad' in df.columns else 0
-        metrics["fake_count"] = int(df['is_fake'].sum()) if 'is_fake' in df.columns else 0
-        metrics["similar_count"] = int(df['similar_id_1'].notna().sum()) if 'similar_id_1' in df.columns else 0
+        label_sums = dict(zip(LABEL_FIELDS, stats["label_sums"].tolist()))
+        metrics["ad_count"] = int(label_sums["is_ad"]) if 'is_ad' in missing_counts else 0
+        metrics["fake_count"] = int(label_sums["is_fake"]) if 'is_fake' in missing_counts else 0
+        metrics["similar_count"] = total - missing_counts['similar_id_1'] if 'similar_id_1' in missing_counts else 0
 
         # 라벨 누락률
-        label_cols = ['is_ad', 'is_fake']
-        missing_labels = sum(df[col].isna().sum() for col in label_cols if col in df.columns)
-        metrics["label_missing_rate"] = round((missing_labels / (len(df) * 2)) * 100, 2)
+        missing_labels = sum(missing_counts[col] for col in LABEL_FIELDS if col in missing_counts)
+        metrics["label_missing_rate"] = round((missing_labels / (total * 2)) * 100, 2)
 
     return metrics
 
 
+def calculate_quality_metrics(df: pd.DataFrame, data_type: str) -> Dict[str, Any]:
+    """데이터 품질 지표 계산"""
+    return metrics_from_stats(compute_dataset_stats(df), data_type)
+
+
+def save_dataset_stats(data_type: str, version: str, stats: Dict[str, Any]):
+    """버전별 누적 통계 저장"""
+    artifact_dir = get_artifact_dir(data_type, version)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    with atomic_open(artifact_dir / "stats.npz", 'wb') as f:
+        np.savez_compressed(
+            f,
+            row_count=np.int64(stats["row_count"]),
+            columns=np.array(stats["columns"], dtype=str),
+            dtypes=np.array(stats["dtypes"], dtype=str),
+            missing_counts=stats["missing_counts"],
+            label_sums=stats["label_sums"],
+            hash_values=stats["hash_values"],
+            hash_counts=stats["hash_counts"],
+        )
+    _dataset_stats_cache[(data_type, version)] = stats
+
+
+def get_dataset_stats(data_type: str, version: Optional[str] = None) -> Dict[str, Any]:
+    """버전별 누적 통계 조회 (처음 보는 버전이면 계산 후 저장)"""
+    version = version or get_current_version(data_type)
+    if (data_type, version) in _dataset_stats_cache:
+        return _dataset_stats_cache[(data_type, version)]
+
+    stats_path = get_artifact_dir(data_type, version) / "stats.npz"
+    if stats_path.exists():
+        with np.load(stats_path) as data:
+            stats = {
+                "row_count": int(data["row_count"]),
+                "columns": data["columns"].tolist(),
+                "dtypes": data["dtypes"].tolist(),
+                "missing_counts": data["missing_counts"],
+                "label_sums": data["label_sums"],
+                "hash_values": data["hash_values"],
+                "hash_counts": data["hash_counts"],
+            }
+        _dataset_stats_cache[(data_type, version)] = stats
+        return stats
+
+    stats = compute_dataset_stats(load_data(data_type, version))
+    save_dataset_stats(data_type, version, stats)
+    return stats
+
+
+def get_dataset_metrics(data_type: str, version: Optional[str] = None) -> Dict[str, Any]:
+    """데이터 품질 지표 (버전 미지정 시 현재 버전)"""
+    return metrics_from_stats(get_dataset_stats(data_type, version), data_type)
+
+
+
+# 검수 결과 컬럼형 테이블 (세션별 항목당 1행)
+# 라벨 값은 1(True), 0(False), -1(미입력)으로 저장
+# 저장 시에는 해당 세션의 조각 파일만 기록하고, 전체 테이블은 분석 조회 시 변경된 조각만 다시 읽어 구성
+# 조각은 결과 파일(result_*.json)로부터 파생되며, 없거나 결과 파일보다 오래되면 다시 생성
+INSPECTION_TABLE_SCHEMA = {
+    "session_id": str,
+    "data_type": str,
+    "round_num": np.int16,
+    "item_id": np.int64,
+    "status": str,
+    "inspector": str,
+    "original_is_ad": np.int8,
+    "is_ad_checked": np.int8,
+    "original_is_fake": np.int8,
+    "is_fake_checked": np.int8,
+    "saved_at": str,
+}
+# 세션별 1행 (검수 항목이 없는 세션도 리포트에 포함하기 위해 별도 보관)
+INSPECTION_SESSION_SCHEMA = {
+    "session_id": str,
+    "data_type": str,
+    "round_num": np.int16,
+    "saved_at": str,
+}
+_inspection_table_lock = threading.Lock()  # 전체 테이블 구성 시에만 사용 (저장 경로에서는 사용하지 않음)
+# 결과가 저장될 때마다 증가하는 세대 번호, 메모리의 테이블은 이 번호로 최신 여부 판단
+_inspection_table_generation = {"value": 0}
+_inspection_table_generation_lock = threading.Lock()
+_inspection_table_state: Dict[str, Any] = {"table": None, "sessions": None, "version": None, "parts": {}}
+_analytics_cache: Dict[Tuple[int, Optional[str]], Dict[str, Any]] = {}
+_analytics_lock = threading.Lock()  # 캐시 조회/폐기/추가를 한 번에 처리
+
+
+def _encode_flag(value: Optional[bool]) -> int:
+    """라벨 값을 테이블 저장용 정수로 변환"""
+    if value is None:
+        return -1
+    return 1 if value else 0
+
+
+def get_session_meta(session_id: str) -> Dict[str, Any]:
+    """세션의 데이터 유형과 검수 차수 조회"""
+    session_file = INSPECTION_DIR / f"session_{session_id}.json"
+    if session_file.exists():
+        with open(session_file, 'r', encoding='utf-8') as f:
+            session_info = json.load(f)
+        return {
+            "data_type": session_info["data_type"],
+            "round_num": session_info.get("round_num", 1),
+            "dataset_version": session_info.get("dataset_version"),
+        }
+
+    # 세션 파일이 없으면 세션 ID 규칙({data_type}_{round}차_{timestamp})으로 추정
+    match = re.match(r"^(preprocessed|labeled)_(\d+)차_", session_id)
+    if match:
+        return {"data_type": match.group(1), "round_num": int(match.group(2)), "dataset_version": None}
+    data_type = "labeled" if "labeled" in session_id else "preprocessed"
+    return {"data_type": data_type, "round_num": 1, "dataset_version": None}
+
+
+def build_inspection_rows(result_data: Dict[str, Any]) -> pd.DataFrame:
+    """검수 결과를 테이블 행으로 변환"""
+    meta = get_session_meta(result_data["session_id"])
+    records = [
+        {
+            "session_id": result_data["session_id"],
+            "data_type": meta["data_type"],
+            "round_num": meta["round_num"],
+            "item_id": int(item["id"]),
+            "status": item.get("status") or "pending",
+            "inspector": item.get("inspector") or "",
+            "original_is_ad": _encode_flag(item.get("original_is_ad")),
+            "is_ad_checked": _encode_flag(item.get("is_ad_checked")),
+            "original_is_fake": _encode_flag(item.get("original_is_fake")),
+            "is_fake_checked": _encode_flag(item.get("is_fake_checked")),
+            "saved_at": result_data["saved_at"],
+        }
+        for item in result_data.get("inspections", [])
+    ]
+    return _to_inspection_table(records)
+
+
+def build_session_row(result_data: Dict[str, Any]) -> pd.DataFrame:
+    """검수 결과를 세션 테이블 행으로 변환"""
+    meta = get_session_meta(result_data["session_id"])
+    record = {
+        "session_id": result_data["session_id"],
+        "data_type": meta["data_type"],
+        "round_num": meta["round_num"],
+        "saved_at": result_data["saved_at"],
+    }
+    return _to_table([record], INSPECTION_SESSION_SCHEMA)
+
+
+def _to_table(records: List[Dict[str, Any]], schema: Dict[str, Any]) -> pd.DataFrame:
+    """레코드 목록을 스키마에 맞는 테이블로 변환"""
+    table = pd.DataFrame.from_records(records, columns=list(schema))
+    return table.astype({col: dtype for col, dtype in schema.items() if dtype is not str})
+
+
+def _to_inspection_table(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """레코드 목록을 검수 결과 테이블로 변환"""
+    return _to_table(records, INSPECTION_TABLE_SCHEMA)
+
+
+def _table_arrays(table: pd.DataFrame, schema: Dict[str, Any], prefix: str = "") -> Dict[str, np.ndarray]:
+    """테이블을 저장용 컬럼별 배열로 변환"""
+    columns = {}
+    for col, dtype in schema.items():
+        if dtype is str:
+            columns[prefix + col] = np.array(table[col].astype(str).tolist(), dtype=str)
+        else:
+            columns[prefix + col] = table[col].to_numpy(dtype=dtype)
+    return columns
+
+
+def get_table_part_path(session_id: str) -> Path:
+    """세션별 테이블 조각 경로"""
+    return INSPECTION_TABLE_DIR / f"{session_id}.npz"
+
+
+def write_table_part(result_data: Dict[str, Any]):
+    """세션의 검수 결과 행과 세션 행을 조각 파일로 저장 (세션 테이블은 sessions__ 접두어)"""
+    with atomic_open(get_table_part_path(result_data["session_id"]), 'wb') as f:
+        np.savez_compressed(
+            f,
+            **_table_arrays(build_inspection_rows(result_data), INSPECTION_TABLE_SCHEMA),
+            **_table_arrays(build_session_row(result_data), INSPECTION_SESSION_SCHEMA, prefix="sessions__"),
+        )
+
+
+def _read_table_part(path: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """조각 파일에서 (검수 결과 행, 세션 행) 로드"""
+    with np.load(path) as data:
+        rows = pd.DataFrame({col: data[col] for col in INSPECTION_TABLE_SCHEMA})
+        session = pd.DataFrame({col: data[f"sessions__{col}"] for col in INSPECTION_SESSION_SCHEMA})
+    return rows, session
+
+
+def _sync_table_part(result_file: Path) -> Path:
+    """결과 파일보다 오래되었거나 없는 조각을 결과 파일로부터 다시 생성"""
+    session_id = result_file.stem[len("result_"):]
+    part_path = get_table_part_path(session_id)
+    if part_path.exists() and part_path.stat().st_mtime_ns >= result_file.stat().st_mtime_ns:
+        return part_path
+
+    # 진행 중인 저장과 겹치지 않도록 세션 잠금 후 다시 확인
+    with get_session_lock(session_id):
+        if not part_path.exists() or part_path.stat().st_mtime_ns < result_file.stat().st_mtime_ns:
+            with open(result_file, 'r', encoding='utf-8') as f:
+                write_table_part(json.load(f))
+    return part_path
+
+
+def bump_inspection_table_generation():
+    """검수 결과 변경을 알려 다음 조회 시 테이블을 다시 구성하도록 함"""
+    with _inspection_table_generation_lock:
+        _inspection_table_generation["value"] += 1
+
+
+def _load_inspection_state() -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+    """최신 세대의 (검수 결과 테이블, 세션 테이블, 버전) 조회 (변경된 조각만 다시 읽음)"""
+    state = _inspection_table_state
+    with _inspection_table_lock:
+        generation = _inspection_table_generation["value"]
+        if state["version"] == generation:
+            return state["table"], state["sessions"], state["version"]
+
+        parts = {}
+        for result_file in INSPECTION_DIR.glob("result_*.json"):
+            part_path = _sync_table_part(result_file)
+            stat = part_path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = state["parts"].get(part_path.stem)
+            parts[part_path.stem] = cached if cached and cached[0] == signature else (signature, *_read_table_part(part_path))
+
+        rows = [part[1] for part in parts.values()]
+        sessions = [part[2] for part in parts.values()]
+        state.update(
+            table=pd.concat(rows, ignore_index=True) if rows else _to_inspection_table([]),
+            sessions=pd.concat(sessions, ignore_index=True) if sessions else _to_table([], INSPECTION_SESSION_SCHEMA),
+            version=generation,
+            parts=parts,
+        )
+        return state["table"], state["sessions"], state["version"]
+
+
+def load_inspection_table() -> Tuple[pd.DataFrame, int]:
+    """검수 결과 테이블과 버전 조회"""
+    table, _, version = _load_inspection_state()
+    return table, version
+
+
+# 검수 결과 저장
+# 같은 세션의 저장만 세션별 잠금으로 직렬화하고, 리비전 번호(ETag)로 동시 편집 충돌을 감지
+_session_locks: Dict[str, threading.Lock] = {}
+_session_locks_guard = threading.Lock()
+
+
+def get_session_lock(session_id: str) -> threading.Lock:
+    """세션별 잠금 객체 조회"""
+    with _session_locks_guard:
+        lock = _session_locks.get(session_id)
+        if lock is None:
+            lock = _session_locks[session_id] = threading.Lock()
+        return lock
+
+
+def get_result_revision(session_id: str) -> int:
+    """저장된 검수 결과의 리비전 (결과가 없으면 0)"""
+    result_file = INSPECTION_DIR / f"result_{session_id}.json"
+    if not result_file.exists():
+        return 0
+    with open(result_file, 'r', encoding='utf-8') as f:
+        return int(json.load(f).get("revision", 0))
+
+
+def revision_etag(revision: int) -> str:
+    """리비전 번호를 ETag 값으로 변환"""
+    return f'"{revision}"'
+
+
+def parse_if_match(if_match: Optional[str]) -> Optional[int]:
+    """If-Match 헤더의 ETag를 리비전 번호로 변환"""
+    if not if_match or if_match.strip() == "*":
+        return None
+    tag = if_match.split(",")[0].strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    try:
+        return int(tag.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"잘못된 If-Match 값입니다: {if_match}")
+
+
+def save_result_file(result_data: Dict[str, Any], expected_revision: Optional[int] = None) -> int:
+    """리비전을 확인한 뒤 검수 결과를 원자적으로 저장하고 새 리비전 반환"""
+    session_id = result_data["session_id"]
+    with get_session_lock(session_id):
+        current = get_result_revision(session_id)
+        if expected_revision is not None and expected_revision != current:
+            raise HTTPException(
+                status_code=409,
+                detail=f"다른 사용자가 먼저 검수 결과를 저장했습니다. (현재 리비전: {current})",
+                headers={"ETag": revision_etag(current)},
+            )
+
+        result_data["revision"] = current + 1
+        write_json_atomic(INSPECTION_DIR / f"result_{session_id}.json", result_data)
+        bump_inspection_table_generation()
+
+        # 분석용 테이블 조각 갱신 (실패해도 결과 파일은 저장되었으므로 다음 분석 조회 시 다시 생성)
+        try:
+            write_table_part(result_data)
+        except Exception:
+            logger.exception("검수 결과 테이블 갱신 실패 (%s)", session_id)
+        return result_data["revision"]
+
+
+def cohen_kappa(a: np.ndarray, b: np.ndarray) -> Optional[float]:
+    """두 판정 배열 간 Cohen's kappa 계산"""
+    n = len(a)
+    if n == 0:
+        return None
+
+    categories, codes = np.unique(np.concatenate([a, b]), return_inverse=True)
+    k = len(categories)
+    confusion = np.bincount(codes[:n] * k + codes[n:], minlength=k * k).reshape(k, k)
+    observed = np.trace(confusion) / n
+    expected = float(confusion.sum(axis=1) @ confusion.sum(axis=0)) / (n * n)
+    if expected >= 1.0:
+        return None
+    return round(float((observed - expected) / (1 - expected)), 4)
+
+
+def _group_stats(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    """그룹별 합격률/라벨 오분류율 집계"""
+    stats = df.groupby(keys, sort=True).agg(
+        item_count=("item_id", "size"),
+        inspected_count=("inspected", "sum"),
+        pass_count=("passed", "sum"),
+        label_mismatch_count=("label_mismatch", "sum"),
+        saved_at=("saved_at", "max"),
+    ).reset_index()
+
+    stats["pass_rate"] = (stats["pass_count"] / stats["inspected_count"].clip(lower=1) * 100).round(2)
+    stats["label_mismatch_rate"] = (stats["label_mismatch_count"] / stats["item_count"] * 100).round(1)
+    return stats
+
+
+def _summarize_groups(df: pd.DataFrame, keys: List[str]) -> List[Dict[str, Any]]:
+    """그룹별 집계 결과를 레코드 목록으로 변환"""
+    return _group_stats(df, keys).to_dict("records")
+
+
+def _summarize_sessions(df: pd.DataFrame, sessions: pd.DataFrame) -> List[Dict[str, Any]]:
+    """세션별 집계 (검수 항목이 없는 세션은 0건, 오분류율 None)"""
+    keys = ["session_id", "data_type", "round_num"]
+    stats = sessions.merge(_group_stats(df, keys).drop(columns="saved_at"), on=keys, how="left")
+    count_columns = ["item_count", "inspected_count", "pass_count", "label_mismatch_count"]
+    stats[count_columns] = stats[count_columns].fillna(0).astype(np.int64)
+    stats["pass_rate"] = stats["pass_rate"].fillna(0.0)
+    stats["label_mismatch_rate"] = stats["label_mismatch_rate"].astype(object).where(
+        stats["label_mismatch_rate"].notna(), None
+    )
+    return stats.sort_values(keys).to_dict("records")
+
+
+def compute_inspection_analytics(table: pd.DataFrame, sessions: pd.DataFrame) -> Dict[str, Any]:
+    """세션/차수/검수자별 통계 및 차수 간 일치도 계산"""
+    df = table.assign(
+        inspector=table["inspector"].replace("", "미지정"),
+        inspected=table["status"] != "pending",
+        passed=table["status"] == "pass",
+        label_mismatch=(table["original_is_ad"] != table["is_ad_checked"])
+        | (table["original_is_fake"] != table["is_fake_checked"]),
+    )
+
+    analytics = {
+        "row_count": len(df),
+        "sessions": _summarize_sessions(df, sessions),
+        "rounds": _summarize_groups(df, ["data_type", "round_num"]),
+        "inspector_drift": _summarize_groups(df, ["inspector", "data_type", "round_num"]),
+    }
+
+    # 차수 간 일치도: 1차/2차 모두 검수된 항목의 최신 판정 비교
+    latest = (
+        df[df["inspected"]]
+        .sort_values("saved_at")
+        .drop_duplicates(["data_type", "round_num", "item_id"], keep="last")
+    )
+    paired = latest[latest["round_num"] == 1].merge(
+        latest[latest["round_num"] == 2], on=["data_type", "item_id"], suffixes=("_r1", "_r2")
+    )
+    agreement = {"paired_items": len(paired)}
+    for field in ["status", "is_ad_checked", "is_fake_checked"]:
+        r1 = paired[f"{field}_r1"].to_numpy()
+        r2 = paired[f"{field}_r2"].to_numpy()
+        if field != "status":
+            valid = (r1 >= 0) & (r2 >= 0)
+            r1, r2 = r1[valid], r2[valid]
+        agreement[field] = {
+            "compared": len(r1),
+            "agreement_rate": round(float((r1 == r2).mean()) * 100, 2) if len(r1) else None,
+            "kappa": cohen_kappa(r1, r2),
+        }
+    analytics["inter_round_agreement"] = agreement
+
+    # 검수자별 혼동 행렬 (행: 원본 라벨 False/True, 열: 검수 라벨 False/True)
+    confusion = {}
+    for field in LABEL_FIELDS:
+        original = df[f"original_{field}"]
+        checked = df[f"{field}_checked"]
+        valid = (original >= 0) & (checked >= 0)
+        counts = pd.crosstab(df.loc[valid, "inspector"], original[valid] * 2 + checked[valid])
+        counts = counts.reindex(columns=range(4), fill_value=0)
+        for inspector, cells in zip(counts.index, counts.to_numpy()):
+            matrix = cells.reshape(2, 2)
+            confusion.setdefault(inspector, {})[field] = {
+                "matrix": matrix.tolist(),
+                "total": int(matrix.sum()),
+                "agreement_rate": round(float(np.trace(matrix) / matrix.sum()) * 100, 2),
+            }
+    analytics["inspector_confusion"] = confusion
+
+    return analytics
+
+
+def get_inspection_analytics(data_type: Optional[str] = None) -> Dict[str, Any]:
+    """테이블 버전별로 캐시된 검수 통계 조회"""
+    table, sessions, version = _load_inspection_state()
+
+    cache_key = (version, data_type)
+    with _analytics_lock:
+        if cache_key not in _analytics_cache:
+            if data_type:
+                table = table[table["data_type"] == data_type]
+                sessions = sessions[sessions["data_type"] == data_type]
+            # 이전 버전의 캐시는 폐기
+            for key in [key for key in _analytics_cache if key[0] != version]:
+                del _analytics_cache[key]
+            _analytics_cache[cache_key] = {"table_version": version, **compute_inspection_analytics(table, sessions)}
+        return _analytics_cache[cache_key]
+
+
+# 질문/답변 전문 검색 (문자 bigram 역색인)
+# 한국어는 형태소 분석 없이도 2글자 단위로 부분 일치 검색이 가능
+# bigram은 두 문자의 코드포인트를 하나의 uint64 키로 합쳐 저장 (앞 글자 << 21 | 뒷 글자)
+# 한 글자 검색어용으로 글자별 postings(char_ 접두어)를 함께 저장
+# 색인은 세그먼트 목록으로 구성되며, 추가 업로드 시 변경분만 새 세그먼트로 색인
+SEARCH_INDEX_FORMAT = 3  # 색인 키 구성이 바뀌면 증가 (이전 형식 색인은 다시 생성)
+SEARCH_INDEX_BATCH_SIZE = 20000  # 색인 생성 시 한 번에 처리할 문서 수
+SEARCH_DOC_BITS = 22  # 세그먼트당 최대 문서 수 2^22
+SEARCH_MAX_SEGMENTS = 8  # 세그먼트가 이보다 많아지면 하나로 병합
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_search_index_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def normalize_search_text(text: Any) -> str:
+    """검색용 정규화 (소문자 변환, 문장부호/공백 통일)"""
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return ""
+    return re.sub(r"[^\w]+", " ", str(text).lower()).strip()
+
+
+def _text_codepoints(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """문서 목록을 공백으로 이어 붙인 코드포인트 배열과 위치별 문서 번호"""
+    lengths = np.array([len(text) + 1 for text in texts], dtype=np.int64)
+    codepoints = np.frombuffer("".join(text + " " for text in texts).encode("utf-32-le"), dtype=np.uint32)
+    return codepoints.astype(np.uint64), np.repeat(np.arange(len(texts), dtype=np.uint64), lengths)
+
+
+def _bigram_keys(chars: np.ndarray, doc_of_position: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """코드포인트 배열에서 (bigram 키, 문서 번호) 배열 추출"""
+    # 공백이 포함된 bigram은 제외 (문서 경계도 공백으로 구분됨)
+    space = np.uint64(ord(" "))
+    left, right = chars[:-1], chars[1:]
+    valid = (left != space) & (right != space)
+    return (left[valid] << np.uint64(21)) | right[valid], doc_of_position[:-1][valid]
+
+
+def _extract_bigrams(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """문서 목록에서 (bigram 키, 문서 번호) 배열 추출"""
+    return _bigram_keys(*_text_codepoints(texts))
+
+
+def _label_flags(df: pd.DataFrame, column: str) -> np.ndarray:
+    """라벨 컬럼을 1/0/-1(미입력) 배열로 변환"""
+    if column not in df.columns:
+        return np.full(len(df), -1, dtype=np.int8)
+    values = df[column]
+    return np.where(values.isna(), -1, values.fillna(False).astype(bool)).astype(np.int8)
+
+
+def _count_postings(keys: np.ndarray, docs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(키, 문서) 쌍을 (키 << SEARCH_DOC_BITS | 문서 번호)로 합쳐 출현 횟수 집계"""
+    return np.unique((keys << np.uint64(SEARCH_DOC_BITS)) | docs, return_counts=True)
+
+
+def _make_postings(combined: np.ndarray, counts: np.ndarray, prefix: str = "") -> Dict[str, np.ndarray]:
+    """정렬된 (키 << SEARCH_DOC_BITS | 문서 번호) 배열로 CSR 형식 postings 생성"""
+    grams = combined >> np.uint64(SEARCH_DOC_BITS)
+    keys, starts = np.unique(grams, return_index=True)
+    return {
+        f"{prefix}keys": keys,
+        f"{prefix}offsets": np.append(starts, len(grams)).astype(np.int64),
+        f"{prefix}postings": (combined & np.uint64(2 ** SEARCH_DOC_BITS - 1)).astype(np.int32),
+        f"{prefix}term_freqs": np.minimum(counts, np.iinfo(np.uint16).max).astype(np.uint16),
+    }
+
+
+def _sorted_postings(combined_parts: List[np.ndarray], count_parts: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """배치별 집계 결과를 이어 붙여 키/문서 순으로 정렬"""
+    combined = np.concatenate(combined_parts) if combined_parts else np.zeros(0, dtype=np.uint64)
+    counts = np.concatenate(count_parts) if count_parts else np.zeros(0, dtype=np.int64)
+    order = np.argsort(combined, kind="stable")
+    return combined[order], counts[order]
+
+
+def _build_segment(df: pd.DataFrame) -> Dict[str, Any]:
+    """데이터 행으로 세그먼트 생성"""
+    if len(df) >= 2 ** SEARCH_DOC_BITS:
+        raise ValueError(f"Too many records to index: {len(df)}")
+
+    questions = df["question"] if "question" in df.columns else pd.Series([""] * len(df))
+    answers = df["answer"] if "answer" in df.columns else pd.Series([""] * len(df))
+    texts = [f"{normalize_search_text(q)} {normalize_search_text(a)}" for q, a in zip(questions, answers)]
+
+    # 배치별로 (bigram, 문서) / (글자, 문서) 쌍의 출현 횟수 집계
+    bigram_parts, char_parts = ([], []), ([], [])
+    doc_len = np.zeros(len(texts), dtype=np.int32)
+    for start in range(0, len(texts), SEARCH_INDEX_BATCH_SIZE):
+        chars, doc_of_position = _text_codepoints(texts[start:start + SEARCH_INDEX_BATCH_SIZE])
+        doc_of_position = doc_of_position + np.uint64(start)
+        keys, docs = _bigram_keys(chars, doc_of_position)
+        doc_len += np.bincount(docs.astype(np.int64), minlength=len(texts)).astype(np.int32)
+        for parts, counted in [
+            (bigram_parts, _count_postings(keys, docs)),
+            (char_parts, _count_postings(chars[chars != ord(" ")], doc_of_position[chars != ord(" ")])),
+        ]:
+            parts[0].append(counted[0])
+            parts[1].append(counted[1])
+
+    return {
+        **_make_postings(*_sorted_postings(*bigram_parts)),
+        **_make_postings(*_sorted_postings(*char_parts), prefix="char_"),
+        "doc_len": doc_len,
+        "ids": df["id"].to_numpy(dtype=np.int64),
+        "is_ad": _label_flags(df, "is_ad"),
+        "is_fake": _label_flags(df, "is_fake"),
+    }
+
+
+def _assemble_search_index(version: str, segments: List[Dict[str, Any]], files: List[str]) -> Dict[str, Any]:
+    """세그먼트 목록을 하나의 문서 번호 공간으로 묶음"""
+    sizes = [len(segment["ids"]) for segment in segments]
+    index = {
+        "version": version,
+        "segments": segments,
+        "segment_files": files,
+        "doc_starts": np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)[:-1],
+    }
+    for field in ["ids", "doc_len", "is_ad", "is_fake"]:
+        index[field] = np.concatenate([segment[field] for segment in segments])
+
+    # 뒤 세그먼트에 같은 id가 있으면 앞의 문서는 갱신된 것으로 간주
+    live = []
+    later_ids = np.zeros(0, dtype=np.int64)
+    for segment in reversed(segments):
+        live.insert(0, ~np.isin(segment["ids"], later_ids))
+        later_ids = np.concatenate([later_ids, segment["ids"]])
+    index["live"] = np.concatenate(live)
+    return index
+
+
+def _merge_segments(index: Dict[str, Any]) -> Dict[str, Any]:
+    """유효한 문서만 남겨 모든 세그먼트를 하나로 병합 (원문 재분석 없음)"""
+    live = index["live"]
+    if live.sum() >= 2 ** SEARCH_DOC_BITS:
+        raise ValueError(f"Too many records to index: {live.sum()}")
+
+    new_doc = (np.cumsum(live) - 1).astype(np.uint64)
+    merged = {}
+    for prefix in ["", "char_"]:
+        combined_parts, count_parts = [], []
+        for segment, start in zip(index["segments"], index["doc_starts"]):
+            grams = np.repeat(segment[f"{prefix}keys"], np.diff(segment[f"{prefix}offsets"]))
+            docs = segment[f"{prefix}postings"].astype(np.int64) + start
+            keep = live[docs]
+            combined_parts.append((grams[keep] << np.uint64(SEARCH_DOC_BITS)) | new_doc[docs[keep]])
+            count_parts.append(segment[f"{prefix}term_freqs"][keep])
+        merged.update(_make_postings(*_sorted_postings(combined_parts, count_parts), prefix=prefix))
+
+    for field in ["doc_len", "ids", "is_ad", "is_fake"]:
+        merged[field] = index[field][live]
+    return merged
+
+
+def save_search_index(
+    data_type: str,
+    version: str,
+    segments: List[Dict[str, Any]],
+    files: List[Optional[str]],
+) -> Dict[str, Any]:
+    """새 세그먼트 파일과 버전별 색인 목록(manifest) 저장"""
+    SEGMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    files = list(files)
+    for i, (segment, name) in enumerate(zip(segments, files)):
+        if name is None:
+            name = f"{data_type}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{i}.npz"
+            with atomic_open(SEGMENTS_DIR / name, 'wb') as f:
+                np.savez_compressed(f, **segment)
+            files[i] = name
+
+    artifact_dir = get_artifact_dir(data_type, version)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    write_json_atomic(artifact_dir / "search.json", {"format": SEARCH_INDEX_FORMAT, "segments": files})
+
+    index = _assemble_search_index(version, segments, files)
+    _search_index_cache[data_type] = index
+    return index
+
+
+def build_search_index(data_type: str, version: Optional[str] = None) -> Dict[str, Any]:
+    """버전 데이터로 검색 색인 전체 생성"""
+    version = version or get_current_version(data_type)
+    df = load_data(data_type, version)
+    return save_search_index(data_type, version, [_build_segment(df)], [None])
+
+
+def append_search_segment(data_type: str, index: Dict[str, Any], rows: pd.DataFrame, version: str) -> Dict[str, Any]:
+    """이전 버전 색인에 추가/변경된 행만 새 세그먼트로 더해 새 버전 색인 생성 (세그먼트가 많아지면 병합)"""
+    segments = index["segments"] + [_build_segment(rows)]
+    files = index["segment_files"] + [None]
+    if len(segments) > SEARCH_MAX_SEGMENTS:
+        merged = _merge_segments(_assemble_search_index(version, segments, files))
+        segments, files = [merged], [None]
+    return save_search_index(data_type, version, segments, files)
+
+
+def load_search_index(data_type: str, version: Optional[str] = None) -> Dict[str, Any]:
+    """버전별 검색 색인 조회 (처음 보는 버전이거나 이전 형식 색인이면 생성)"""
+    version = version or get_current_version(data_type)
+    index = _search_index_cache.get(data_type)
+    if index is not None and index["version"] == version:
+        return index
+
+    manifest_path = get_artifact_dir(data_type, version) / "search.json"
+    manifest = None
+    if manifest_path.exists():
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    if manifest is not None and manifest.get("format") == SEARCH_INDEX_FORMAT:
+        segments = []
+        for name in manifest["segments"]:
+            with np.load(SEGMENTS_DIR / name) as data:
+                segments.append({key: data[key] for key in data.files})
+        index = _assemble_search_index(version, segments, manifest["segments"])
+        _search_index_cache[data_type] = index
+        return index
+
+    return build_search_index(data_type, version)
+
+
+def _lookup_postings(segment: Dict[str, Any], key: np.uint64, prefix: str = "") -> Tuple[np.ndarray, np.ndarray]:
+    """세그먼트에서 키 하나의 (문서 번호, 출현 횟수) 조회"""
+    keys, offsets = segment[f"{prefix}keys"], segment[f"{prefix}offsets"]
+    pos = np.searchsorted(keys, key)
+    if pos < len(keys) and keys[pos] == key:
+        span = slice(offsets[pos], offsets[pos + 1])
+        return segment[f"{prefix}postings"][span], segment[f"{prefix}term_freqs"][span].astype(np.float64)
+    return np.zeros(0, dtype=np.int32), np.zeros(0)
+
+
+def _segment_terms(segment: Dict[str, Any], tokens: List[str]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """세그먼트에서 검색어 bigram별 (문서 번호, 출현 횟수) 목록 조회"""
+    terms = []
+    for token in tokens:
+        if len(token) == 1:
+            # 한 글자 검색어는 글자별 postings로 조회
+            terms.append(_lookup_postings(segment, np.uint64(ord(token)), prefix="char_"))
+            continue
+
+        token_keys, _ = _extract_bigrams([token])
+        for key in np.unique(token_keys):
+            terms.append(_lookup_postings(segment, key))
+    return terms
+
+
+def _query_terms(index: Dict[str, Any], query: str) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """검색어를 bigram 단위로 분해해 전체 세그먼트의 (문서 번호, 출현 횟수) 목록 반환"""
+    tokens = sorted(set(normalize_search_text(query).split()))
+    per_segment = [
+        _segment_terms(segment, tokens) for segment in index["segments"]
+    ]
+    if not per_segment:
+        return []
+    return [
+        (
+            np.concatenate([terms[i][0] + start for terms, start in zip(per_segment, index["doc_starts"])]),
+            np.concatenate([terms[i][1] for terms in per_segment]),
+        )
+        for i in range(len(per_segment[0]))
+    ]
+
+
+def search_documents(
+    index: Dict[str, Any],
+    query: str,
+    is_ad: Optional[bool] = None,
+    is_fake: Optional[bool] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """검색어의 모든 bigram을 포함하는 문서를 BM25 점수순으로 반환"""
+    doc_count = len(index["ids"])
+    terms = _query_terms(index, query)
+    if not terms or doc_count == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    # 문서 수/평균 길이/문서 빈도는 유효한 문서만 기준 (갱신되어 가려진 문서 제외)
+    live = index["live"]
+    doc_len = index["doc_len"]
+    live_count = int(live.sum())
+    avg_len = max(float(doc_len[live].mean()) if live_count else 0.0, 1.0)
+    scores = np.zeros(doc_count)
+    matched = np.zeros(doc_count, dtype=np.int32)
+    for docs, freqs in terms:
+        doc_freq = int(live[docs].sum())
+        idf = np.log(1 + (live_count - doc_freq + 0.5) / (doc_freq + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[docs] / avg_len)
+        scores[docs] += idf * freqs * (BM25_K1 + 1) / (freqs + norm)
+        matched[docs] += 1
+
+    mask = (matched == len(terms)) & live
+    if is_ad is not None:
+        mask &= index["is_ad"] == int(is_ad)
+    if is_fake is not None:
+        mask &= index["is_fake"] == int(is_fake)
+
+    candidates = np.flatnonzero(mask)
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order, scores[order]
+
+
+# 데이터 업로드 (전체 교체 / id 기준 증분 병합)
+# 업로드마다 새 버전이 생성되며, 이미 있는 버전의 파생 데이터는 다시 계산하지 않음
+SEGMENT_GC_GRACE_SECONDS = 600  # 작성 직후의 세그먼트는 삭제하지 않음
+
+def _pinned_versions(data_type: str) -> Dict[str, int]:
+    """세션이 참조하는 버전별 세션 수"""
+    pinned: Dict[str, int] = {}
+    for file in INSPECTION_DIR.glob(f"session_{data_type}_*.json"):
+        with open(file, 'r', encoding='utf-8') as f:
+            version = json.load(f).get("dataset_version")
+        if version:
+            pinned[version] = pinned.get(version, 0) + 1
+    return pinned
+
+
+def list_dataset_versions(data_type: str) -> List[Dict[str, Any]]:
+    """저장된 버전 목록 (최근 생성/사용 순)"""
+    current = get_current_version(data_type) if get_data_path(data_type).exists() else None
+    pinned = _pinned_versions(data_type)
+    paths = sorted(VERSIONS_DIR.glob(f"{data_type}_*.csv"), key=lambda p: p.stat().st_mtime, reverse=True)
+    return [
+        {
+            "version": path.stem[len(data_type) + 1:],
+            "file_size": path.stat().st_size,
+            "updated_at": datetime.fromtimestamp(path.stat().st_mtime).isoformat(),
+            "is_current": path.stem[len(data_type) + 1:] == current,
+            "session_count": pinned.get(path.stem[len(data_type) + 1:], 0),
+        }
+        for path in paths
+    ]
+
+
+def collect_dataset_versions(data_type: str) -> List[str]:
+    """보존 정책에 따라 오래된 버전과 파생 데이터 삭제
+    (현재 버전, 최근 DATASET_RETENTION_COUNT개, 세션이 참조하는 버전은 보존)"""
+    removed = []
+    for rank, info in enumerate(list_dataset_versions(data_type)):
+        if info["is_current"] or info["session_count"] > 0 or rank < DATASET_RETENTION_COUNT:
+            continue
+        version = info["version"]
+        get_version_path(data_type, version).unlink()
+        shutil.rmtree(get_artifact_dir(data_type, version), ignore_errors=True)
+        _dataset_cache.pop((data_type, version), None)
+        _dataset_stats_cache.pop((data_type, version), None)
+        removed.append(version)
+
+    # 어떤 버전의 색인 목록에도 없는 세그먼트 삭제
+    referenced = set()
+    for manifest_path in INDEX_DIR.glob("*/search.json"):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            referenced.update(json.load(f)["segments"])
+    for path in SEGMENTS_DIR.glob("*.npz"):
+        if path.name not in referenced and time.time() - path.stat().st_mtime > SEGMENT_GC_GRACE_SECONDS:
+            path.unlink()
+
+    return removed
+
+
+def replace_data(data_type: str, content: bytes) -> str:
+    """새 데이터 파일을 버전으로 등록 (처음 보는 버전이면 누적 통계와 검색 색인 생성)
+    검증과 파생 데이터 생성이 끝난 뒤에 현재 버전으로 전환하므로, 실패해도 기존 버전이 유지됨"""
+    df = pd.read_csv(io.BytesIO(content))
+    df.columns = [str(col).replace('\ufeff', '') for col in df.columns]
+    if "id" not in df.columns or df["id"].isna().any():
+        raise ValueError("All rows must have an 'id' value")
+
+    with _dataset_write_lock:
+        tmp_path = _new_version_tmp_path()
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        version = _store_version_file(data_type, tmp_path, move=True)
+        if (data_type, version) not in _dataset_cache:
+            _cache_dataset(data_type, version, df)
+
+        get_dataset_stats(data_type, version)
+        load_search_index(data_type, version)
+        activate_dataset_version(data_type, version)
+        collect_dataset_versions(data_type)
+        return version
+
+
+def append_data(data_type: str, content: bytes) -> Dict[str, Any]:
+    """id 기준으로 추가/변경된 행만 병합한 새 버전 생성, 누적 통계/id 인덱스/검색 색인은 이전 버전에서 증분 갱신"""
+    with _dataset_write_lock:
+        base_version = get_current_version(data_type)
+        base = load_data(data_type, base_version)
+        stats = get_dataset_stats(data_type, base_version)
+        index = load_search_index(data_type, base_version)
+        id_index = get_id_index(data_type, base_version)
+
+        delta = pd.read_csv(io.BytesIO(content))
+        delta.columns = [str(col).replace('\ufeff', '') for col in delta.columns]
+        if "id" not in delta.columns or delta["id"].isna().any():
+            raise ValueError("All rows must have an 'id' value")
+        unknown_columns = sorted(set(delta.columns) - set(base.columns))
+        if unknown_columns:
+            raise ValueError(f"Unknown columns: {unknown_columns}")
+        omitted_columns = [col for col in base.columns if col not in delta.columns]
+        delta = delta.reindex(columns=base.columns).drop_duplicates("id", keep="last").reset_index(drop=True)
+
+        # 기존 행 위치는 유지: 변경된 행은 제자리에서 교체, 신규 행은 뒤에 추가
+        positions = id_index.reindex(delta["id"].to_numpy())
+        is_changed = positions.notna().to_numpy()
+        changed_positions = positions[is_changed].to_numpy(dtype=np.int64)
+        new_count = int((~is_changed).sum())
+
+        # 변경된 행은 업로드에 포함된 컬럼만 갱신하고 나머지 컬럼은 기존 값 유지
+        if omitted_columns and len(changed_positions):
+            source_positions = np.zeros(len(delta), dtype=np.int64)
+            source_positions[is_changed] = changed_positions
+            kept = base[omitted_columns].iloc[source_positions].reset_index(drop=True)
+            delta[omitted_columns] = kept.where(pd.Series(is_changed), axis=0)
+
+        # 결측이 생기는 정수/불리언 컬럼은 nullable 타입으로 맞춰 기존 행의 저장 형식(528 → 528.0 방지)과 행 해시 유지
+        nullable_columns = {}
+        for col in base.columns:
+            dtype = base[col].dtype
+            if not delta[col].isna().any():
+                continue
+            if pd.api.types.is_bool_dtype(dtype):
+                nullable = "boolean"
+            elif pd.api.types.is_integer_dtype(dtype):
+                nullable = "Int64"
+            else:
+                continue
+            try:
+                delta[col] = delta[col].astype(nullable)
+            except (TypeError, ValueError):
+                continue  # 정수/불리언으로 표현할 수 없는 값이 있으면 기존 방식대로 타입 확장
+            nullable_columns[col] = nullable
+        if nullable_columns:
+            base = base.astype(nullable_columns)
+
+        take = np.arange(len(base))
+        take[changed_positions] = len(base) + np.flatnonzero(is_changed)
+        take = np.concatenate([take, len(base) + np.flatnonzero(~is_changed)])
+        merged = pd.concat([base, delta], ignore_index=True).iloc[take].reset_index(drop=True)
+        delta_rows = merged.iloc[np.concatenate([changed_positions, len(base) + np.arange(new_count)])]
+
+        # 신규 행만 있으면 이전 버전 파일 끝에 추가, 변경된 행이 있으면 전체 작성
+        tmp_path = _new_version_tmp_path()
+        if len(changed_positions) == 0:
+            shutil.copyfile(get_version_path(data_type, base_version), tmp_path)
+            needs_newline = False
+            if tmp_path.stat().st_size > 0:
+                with open(tmp_path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    needs_newline = f.read(1) != b"\n"
+            with open(tmp_path, 'a', encoding='utf-8', newline='') as f:
+                if needs_newline:
+                    f.write("\n")
+                delta_rows.to_csv(f, header=False, index=False, lineterminator="\n")
+        else:
+            merged.to_csv(tmp_path, index=False)
+        version = commit_dataset_file(data_type, tmp_path)
+
+        result = {
+            "dataset_version": version,
+            "appended_count": new_count,
+            "updated_count": len(changed_positions),
+            "total_records": len(merged),
+        }
+        if version == base_version:
+            return result
+
+        # id 인덱스: 신규 id만 추가
+        new_ids = pd.Series(len(base) + np.arange(new_count), index=merged["id"].to_numpy()[len(base):])
+        _cache_dataset(data_type, version, merged, pd.concat([id_index, new_ids]))
+
+        # 누적 통계: 교체된 행을 빼고 변경분을 더함 (컬럼 타입이 바뀌면 전체 재계산)
+        if not (get_artifact_dir(data_type, version) / "stats.npz").exists():
+            if stats_dtype_names(stats["dtypes"]) == stats_dtype_names(merged.dtypes):
+                stats = combine_dataset_stats(stats, compute_dataset_stats(base.iloc[changed_positions]), sign=-1)
+                stats = combine_dataset_stats(stats, compute_dataset_stats(delta_rows))
+            else:
+                stats = compute_dataset_stats(merged)
+            save_dataset_stats(data_type, version, stats)
+
+        # 검색 색인: 변경분만 새 세그먼트로 추가
+        if not (get_artifact_dir(data_type, version) / "search.json").exists():
+            append_search_segment(data_type, index, delta_rows, version)
+
+        collect_dataset_versions(data_type)
+        return result
+
+
+# 검수 결과 내보내기 (CSV/XLSX 스트리밍)
+# 원본 질문/답변은 id 인덱스로 청크 단위 조회해 결합
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_CSV_BUFFER_SIZE = 64 * 1024
+SESSION_EXPORT_COLUMNS = [
+    "session_id", "id", "status", "inspector", "comment",
+    "original_is_ad", "is_ad_checked", "original_is_fake", "is_fake_checked",
+    "similarity_checks", "question", "answer",
+]
+REPORT_EXPORT_COLUMNS = [
+    "session_id", "data_type", "round_num", "id", "status", "inspector",
+    "original_is_ad", "is_ad_checked", "original_is_fake", "is_fake_checked",
+    "saved_at", "question", "answer",
+]
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _source_texts(data_type: str, ids: List[int], version: Optional[str] = None) -> Dict[int, Tuple[Any, Any]]:
+    """id 목록의 원본 질문/답변 조회 (데이터 파일이 없으면 빈 결과)"""
+    try:
+        rows = lookup_rows(data_type, ids, version)
+    except FileNotFoundError:
+        return {}
+    questions = rows["question"] if "question" in rows.columns else pd.Series([None] * len(rows))
+    answers = rows["answer"] if "answer" in rows.columns else pd.Series([None] * len(rows))
+    return {
+        int(item_id): (q if pd.notna(q) else "", a if pd.notna(a) else "")
+        for item_id, q, a in zip(rows["id"], questions, answers)
+    }
+
+
+def _format_similarity_checks(checks: Optional[List[Dict[str, Any]]]) -> str:
+    """유사도 검수 결과를 '유사ID(점수)=판정' 형식 문자열로 변환"""
+    labels = {True: "유사", False: "비유사", None: "미검수"}
+    return "; ".join(
+        f"{check['similar_id']}({check['similarity_score']:.2f})={labels[check.get('is_similar')]}"
+        for check in checks or []
+    )
+
+
+def iter_session_export_rows(result: Dict[str, Any], data_type: str, version: Optional[str] = None) -> Iterator[List[Any]]:
+    """세션 검수 결과를 세션이 샘플링한 버전의 원본 데이터와 결합해 행 단위로 생성"""
+    inspections = result.get("inspections", [])
+    for start in range(0, len(inspections), EXPORT_CHUNK_SIZE):
+        chunk = inspections[start:start + EXPORT_CHUNK_SIZE]
+        texts = _source_texts(data_type, [int(item["id"]) for item in chunk], version)
+        for item in chunk:
+            question, answer = texts.get(int(item["id"]), (item.get("question") or "", item.get("answer") or ""))
+            yield [
+                result["session_id"], item["id"], item.get("status"), item.get("inspector") or "",
+                item.get("comment") or "",
+                item.get("original_is_ad"), item.get("is_ad_checked"),
+                item.get("original_is_fake"), item.get("is_fake_checked"),
+                _format_similarity_checks(item.get("similarity_checks")),
+                question, answer,
+            ]
+
+
+def iter_report_export_rows(table: pd.DataFrame) -> Iterator[List[Any]]:
+    """검수 결과 테이블 전체를 원본 데이터와 결합해 행 단위로 생성"""
+    table = table.sort_values(["saved_at", "session_id"], ascending=[False, True], kind="stable")
+    flags = {1: True, 0: False, -1: None}
+    session_versions = {
+        session_id: get_session_meta(session_id)["dataset_version"] for session_id in table["session_id"].unique()
+    }
+    for start in range(0, len(table), EXPORT_CHUNK_SIZE):
+        chunk = table.iloc[start:start + EXPORT_CHUNK_SIZE]
+        texts = {}
+        for session_id, group in chunk.groupby("session_id"):
+            data_type = group["data_type"].iloc[0]
+            texts[session_id] = _source_texts(data_type, group["item_id"].tolist(), session_versions[session_id])
+        for row in chunk.itertuples(index=False):
+            question, answer = texts[row.session_id].get(int(row.item_id), ("", ""))
+            yield [
+                row.session_id, row.data_type, int(row.round_num), int(row.item_id), row.status, row.inspector,
+                flags[row.original_is_ad], flags[row.is_ad_checked],
+                flags[row.original_is_fake], flags[row.is_fake_checked],
+                row.saved_at, question, answer,
+            ]
+
+
+def stream_csv(columns: List[str], rows: Iterable[List[Any]]) -> Iterator[str]:
+    """행 단위로 CSV 텍스트 생성 (엑셀 한글 호환을 위해 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= EXPORT_CSV_BUFFER_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_xlsx(sheets: List[Tuple[str, List[str], Iterable[List[Any]]]]) -> Path:
+    """write-only 모드로 임시 XLSX 파일 작성 (행은 메모리에 쌓지 않음)"""
+    workbook = Workbook(write_only=True)
+    for title, columns, rows in sheets:
+        worksheet = workbook.create_sheet(title)
+        worksheet.append(columns)
+        for row in rows:
+            worksheet.append([
+                ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value for value in row
+            ])
+
+    with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as f:
+        path = Path(f.name)
+    try:
+        workbook.save(path)
+    except Exception:
+        path.unlink()
+        raise
+    return path
+
+
+def export_response(filename: str, columns: List[str], rows: Iterable[List[Any]], file_format: str, extra_sheets=None):
+    """형식에 맞는 다운로드 응답 생성"""
+    if file_format == "csv":
+        return StreamingResponse(
+            stream_csv(columns, rows),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename + '.csv')}"}
+        )
+
+    path = write_xlsx([("검수결과", columns, rows)] + (extra_sheets or []))
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=f"{filename}.xlsx",
+        background=BackgroundTask(path.unlink)
+    )
+
+
 # API 엔드포인트
 @app.get("/")
 def read_root():
@@ -168,7 +1487,8 @@ def get_data_summary():
             summary["preprocessed"] = {
                 "exists": True,
                 "count": len(prep_df),
-                "columns": list(prep_df.columns)
+                "columns": list(prep_df.columns),
+                "dataset_version": get_current_version("preprocessed")
             }
         else:
             summary["preprocessed"] = {"exists": False}
@@ -178,7 +1498,8 @@ def get_data_summary():
             summary["labeled"] = {
                 "exists": True,
                 "count": len(label_df),
-                "columns": list(label_df.columns)
+                "columns": list(label_df.columns),
+                "dataset_version": get_current_version("labeled")
             }
         else:
             summary["labeled"] = {"exists": False}
@@ -193,16 +1514,16 @@ def get_data_summary():
 def get_quality_metrics(data_type: str):
     """품질 지표 조회"""
     try:
-        df = load_data(data_type)
-        metrics = calculate_quality_metrics(df, data_type)
+        metrics = get_dataset_metrics(data_type)
+        record_count = metrics["total_records"]
 
         # 판정 기준
         if data_type == "preprocessed":
             criteria = {
                 "record_count": {
-                    "value": len(df),
+                    "value": record_count,
                     "threshold": 100000,
-                    "passed": len(df) >= 100000,
+                    "passed": record_count >= 100000,
                     "description": "레코드 수 ≥ 100,000건"
                 },
                 "missing_rate": {
@@ -227,9 +1548,9 @@ def get_quality_metrics(data_type: str):
         else:  # labeled
             criteria = {
                 "record_count": {
-                    "value": len(df),
+                    "value": record_count,
                     "threshold": 10000,
-                    "passed": len(df) >= 10000,
+                    "passed": record_count >= 10000,
                     "description": "라벨링 수량 ≥ 10,000건"
                 },
                 "label_missing_rate": {
@@ -258,7 +1579,9 @@ def create_sample(
 ):
     """샘플링 생성"""
     try:
-        df = load_data(data_type)
+        # 세션은 샘플링 시점의 데이터 버전에 고정
+        dataset_version = get_current_version(data_type)
+        df = load_data(data_type, dataset_version)
 
         # 샘플링
         np.random.seed(seed)
@@ -302,20 +1625,20 @@ def create_sample(
             "sample_size": len(sample_df),
             "total_size": len(df),
             "seed": seed,
+            "dataset_version": dataset_version,
             "created_at": datetime.now().isoformat(),
             "sample_ids": sample_df['id'].tolist() if 'id' in sample_df.columns else list(range(len(sample_df)))
         }
 
         # 저장
-        session_file = INSPECTION_DIR / f"session_{session_id}.json"
-        with open(session_file, 'w', encoding='utf-8') as f:
-            json.dump(session_info, f, ensure_ascii=False, indent=2)
+        write_json_atomic(INSPECTION_DIR / f"session_{session_id}.json", session_info)
 
         return {
             "session_id": session_id,
             "session_info": session_info,
             "sample_data": sample_data,
-            "similar_items": similar_items_map  # 유사 항목 데이터
+            "similar_items": similar_items_map,  # 유사 항목 데이터
+            "result_revision": 0  # 새 세션이므로 저장된 검수 결과 없음
         }
 
     except Exception as e:
@@ -351,7 +1674,7 @@ def get_inspection_session(session_id: str):
             session_info = json.load(f)
 
         # 데이터 로드
-        df = load_data(session_info['data_type'])
+        df = load_data(session_info['data_type'], session_info.get('dataset_version'))
         sample_ids = session_info['sample_ids']
         sample_df = df[df['id'].isin(sample_ids)]
 
@@ -386,7 +1709,8 @@ def get_inspection_session(session_id: str):
             "session_id": session_id,
             "session_info": session_info,
             "sample_data": sample_data,
-            "similar_items": similar_items_map
+            "similar_items": similar_items_map,
+            "result_revision": get_result_revision(session_id)
         }
 
     except HTTPException:
@@ -396,12 +1720,9 @@ def get_inspection_session(session_id: str):
 
 
 @app.post("/api/inspection/save")
-def save_inspection_result(result: InspectionResult):
-    """검수 결과 저장"""
+def save_inspection_result(result: InspectionResult, response: Response, if_match: Optional[str] = Header(None)):
+    """검수 결과 저장 (revision 또는 If-Match 지정 시 충돌 검사)"""
     try:
-        # 검수 결과 파일 저장
-        result_file = INSPECTION_DIR / f"result_{result.session_id}.json"
-
         result_data = {
             "session_id": result.session_id,
             "total_items": len(result.inspections),
@@ -443,21 +1764,25 @@ def save_inspection_result(result: InspectionResult):
                     (correct_similarity_checks / total_similarity_checks) * 100, 2
                 )
 
-        with open(result_file, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        expected_revision = result.revision if result.revision is not None else parse_if_match(if_match)
+        revision = save_result_file(result_data, expected_revision)
+        response.headers["ETag"] = revision_etag(revision)
 
         return {
             "success": True,
             "message": "검수 결과가 저장되었습니다.",
+            "revision": revision,
             "result_summary": result_data
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/inspection/result/{session_id}")
-def get_inspection_result(session_id: str):
+def get_inspection_result(session_id: str, response: Response):
     """검수 결과 조회"""
     try:
         result_file = INSPECTION_DIR / f"result_{session_id}.json"
@@ -468,6 +1793,8 @@ def get_inspection_result(session_id: str):
         with open(result_file, 'r', encoding='utf-8') as f:
             result = json.load(f)
 
+        result.setdefault("revision", 0)
+        response.headers["ETag"] = revision_etag(result["revision"])
         return result
 
     except HTTPException:
@@ -489,48 +1816,28 @@ def get_report_summary():
 
         # 전처리 데이터 지표
         if PREPROCESSED_DATA_PATH.exists():
-            df = load_data("preprocessed")
-            metrics = calculate_quality_metrics(df, "preprocessed")
+            metrics = get_dataset_metrics("preprocessed")
             report["preprocessed_data"] = metrics
 
         # 라벨링 데이터 지표
         if LABELED_DATA_PATH.exists():
-            df = load_data("labeled")
-            metrics = calculate_quality_metrics(df, "labeled")
+            metrics = get_dataset_metrics("labeled")
             report["labeled_data"] = metrics
 
-        # 검수 세션 결과
-        for file in INSPECTION_DIR.glob("result_*.json"):
-            with open(file, 'r', encoding='utf-8') as f:
-                result = json.load(f)
-
-                session_info = {
-                    "session_id": result["session_id"],
-                    "pass_rate": result["pass_rate"],
-                    "inspected_count": result["inspected_count"],
-                    "saved_at": result["saved_at"]
-                }
-
-                # 라벨링 데이터인 경우 라벨 오분류율 계산
-                if 'labeled' in result["session_id"]:
-                    inspections = result.get("inspections", [])
-                    if inspections:
-                        label_mismatch_count = 0
-                        for inspection in inspections:
-                            original_is_ad = inspection.get("original_is_ad")
-                            is_ad_checked = inspection.get("is_ad_checked")
-                            original_is_fake = inspection.get("original_is_fake")
-                            is_fake_checked = inspection.get("is_fake_checked")
-
-                            # 광고 또는 허위정보 라벨이 원본과 다르면 오분류
-                            if (original_is_ad != is_ad_checked) or (original_is_fake != is_fake_checked):
-                                label_mismatch_count += 1
+        # 검수 세션 결과 (컬럼형 테이블에서 세션별 집계)
+        for session in get_inspection_analytics()["sessions"]:
+            session_info = {
+                "session_id": session["session_id"],
+                "pass_rate": session["pass_rate"],
+                "inspected_count": session["inspected_count"],
+                "saved_at": session["saved_at"]
+            }
 
-                        # 라벨 오분류율 계산
-                        label_mismatch_rate = round((label_mismatch_count / len(inspections)) * 100, 1)
-                        session_info["label_mismatch_rate"] = label_mismatch_rate
+            # 라벨링 데이터인 경우 라벨 오분류율 포함 (검수 항목이 없으면 제외)
+            if session["data_type"] == "labeled" and session["label_mismatch_rate"] is not None:
+                session_info["label_mismatch_rate"] = session["label_mismatch_rate"]
 
-                report["inspection_sessions"].append(session_info)
+            report["inspection_sessions"].append(session_info)
 
         # 저장 시간 순으로 정렬 (최신순)
         report["inspection_sessions"].sort(key=lambda x: x["saved_at"], reverse=True)
@@ -541,6 +1848,140 @@ def get_report_summary():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/analytics/inspections")
+def get_analytics_inspections(
+    data_type: Optional[str] = Query(None, description="preprocessed or labeled (미지정 시 전체)")
+):
+    """검수 결과 분석 (합격률, 라벨 오분류, 차수 간 일치도, 검수자별 혼동 행렬)"""
+    try:
+        if data_type not in [None, "preprocessed", "labeled"]:
+            raise HTTPException(status_code=400, detail="Invalid data_type. Use 'preprocessed' or 'labeled'")
+
+        return get_inspection_analytics(data_type)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/search/{data_type}")
+def search_data(
+    data_type: str,
+    q: str = Query(..., min_length=1, description="검색어 (질문/답변)"),
+    is_ad: Optional[bool] = Query(None, description="광고 여부 필터"),
+    is_fake: Optional[bool] = Query(None, description="허위정보 여부 필터"),
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    page_size: int = Query(20, ge=1, le=100, description="페이지 크기")
+):
+    """질문/답변 전문 검색"""
+    try:
+        if data_type not in ["preprocessed", "labeled"]:
+            raise HTTPException(status_code=400, detail="Invalid data_type. Use 'preprocessed' or 'labeled'")
+
+        started = time.perf_counter()
+        index = load_search_index(data_type)
+        version = index["version"]
+        docs, scores = search_documents(index, q, is_ad=is_ad, is_fake=is_fake)
+
+        # 현재 페이지 문서만 원본 데이터에서 조회
+        page_slice = slice((page - 1) * page_size, page * page_size)
+        page_ids = index["ids"][docs[page_slice]]
+        score_by_id = dict(zip(page_ids.tolist(), scores[page_slice].tolist()))
+        label_columns = [col for col in LABEL_FIELDS if col in load_data(data_type, version).columns]
+        rows = lookup_rows(data_type, page_ids, version)
+
+        results = []
+        for record in rows[["id", "question", "answer"] + label_columns].to_dict("records"):
+            item = {
+                "id": int(record["id"]),
+                "question": record["question"] if pd.notna(record["question"]) else "",
+                "answer": record["answer"] if pd.notna(record["answer"]) else "",
+                "score": round(score_by_id[int(record["id"])], 4),
+            }
+            for col in label_columns:
+                item[col] = bool(record[col]) if pd.notna(record[col]) else None
+            results.append(item)
+
+        return {
+            "query": q,
+            "total": len(docs),
+            "page": page,
+            "page_size": page_size,
+            "results": results,
+            "dataset_version": version,
+            "took_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/export/session/{session_id}")
+def export_session(
+    session_id: str,
+    file_format: str = Query("csv", alias="format", description="csv or xlsx")
+):
+    """세션 검수 결과 내보내기"""
+    try:
+        if file_format not in ["csv", "xlsx"]:
+            raise HTTPException(status_code=400, detail="Invalid format. Use 'csv' or 'xlsx'")
+
+        result_file = INSPECTION_DIR / f"result_{session_id}.json"
+        if not result_file.exists():
+            raise HTTPException(status_code=404, detail="검수 결과를 찾을 수 없습니다.")
+
+        with open(result_file, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+
+        meta = get_session_meta(session_id)
+        rows = iter_session_export_rows(result, meta["data_type"], meta["dataset_version"])
+        return export_response(f"검수결과_{session_id}", SESSION_EXPORT_COLUMNS, rows, file_format)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/export/report")
+def export_report(
+    file_format: str = Query("csv", alias="format", description="csv or xlsx"),
+    data_type: Optional[str] = Query(None, description="preprocessed or labeled (미지정 시 전체)")
+):
+    """전체 검수 결과 리포트 내보내기 (XLSX는 세션 요약 시트 포함)"""
+    try:
+        if file_format not in ["csv", "xlsx"]:
+            raise HTTPException(status_code=400, detail="Invalid format. Use 'csv' or 'xlsx'")
+        if data_type not in [None, "preprocessed", "labeled"]:
+            raise HTTPException(status_code=400, detail="Invalid data_type. Use 'preprocessed' or 'labeled'")
+
+        table, _ = load_inspection_table()
+        if data_type:
+            table = table[table["data_type"] == data_type]
+
+        summary_columns = [
+            "session_id", "data_type", "round_num", "item_count", "inspected_count",
+            "pass_count", "pass_rate", "label_mismatch_rate", "saved_at",
+        ]
+        summary_rows = (
+            [session[col] for col in summary_columns]
+            for session in get_inspection_analytics(data_type)["sessions"]
+        )
+        filename = f"검수리포트_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        return export_response(
+            filename, REPORT_EXPORT_COLUMNS, iter_report_export_rows(table), file_format,
+            extra_sheets=[("세션요약", summary_columns, summary_rows)]
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 class AIInspectionRequest(BaseModel):
     question: str
     answer: str
@@ -549,12 +1990,18 @@ class AIInspectionRequest(BaseModel):
 
 class BatchInspectionRequest(BaseModel):
     session_id: str
+    revision: Optional[int] = None  # 검수를 시작한 결과 리비전 (미지정 시 저장된 결과가 없어야 함)
+    overwrite: bool = False  # True이면 리비전 확인 없이 기존 결과를 덮어씀
 
 
 @app.post("/api/ai/batch-inspect")
-async def batch_inspect(request: BatchInspectionRequest):
+async def batch_inspect(request: BatchInspectionRequest, response: Response, if_match: Optional[str] = Header(None)):
     """전체 샘플 자동 검수"""
     try:
+        expected_revision = request.revision if request.revision is not None else parse_if_match(if_match)
+        if expected_revision is None and not request.overwrite:
+            expected_revision = 0
+
         if not openai_client:
             raise HTTPException(status_code=503, detail="OpenAI API가 설정되지 않았습니다.")
 
@@ -567,7 +2014,7 @@ async def batch_inspect(request: BatchInspectionRequest):
             session_info = json.load(f)
 
         # 데이터 로드
-        df = load_data(session_info['data_type'])
+        df = load_data(session_info['data_type'], session_info.get('dataset_version'))
         sample_ids = session_info['sample_ids']
         sample_df = df[df['id'].isin(sample_ids)]
 
@@ -710,14 +2157,14 @@ async def batch_inspect(request: BatchInspectionRequest):
                     (correct_similarity_checks / total_similarity_checks) * 100, 2
                 )
 
-        # 파일 저장
-        result_file = INSPECTION_DIR / f"result_{request.session_id}.json"
-        with open(result_file, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        # 파일 저장 (세션 잠금 대기가 이벤트 루프를 막지 않도록 스레드풀에서 실행)
+        revision = await run_in_threadpool(save_result_file, result_data, expected_revision)
+        response.headers["ETag"] = revision_etag(revision)
 
         return {
             "success": True,
             "message": "AI 자동 검수가 완료되었습니다.",
+            "revision": revision,
             "result_summary": {
                 "total_items": result_data["total_items"],
                 "pass_count": result_data["pass_count"],
@@ -726,36 +2173,54 @@ async def batch_inspect(request: BatchInspectionRequest):
             }
         }
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/api/data/versions/{data_type}")
+def get_dataset_versions(data_type: str):
+    """데이터셋 버전 목록 조회"""
+    try:
+        if data_type not in ["preprocessed", "labeled"]:
+            raise HTTPException(status_code=400, detail="Invalid data_type. Use 'preprocessed' or 'labeled'")
+
+        return {"data_type": data_type, "versions": list_dataset_versions(data_type)}
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/data/upload/{data_type}")
-async def upload_data_file(data_type: str, file: UploadFile = File(...)):
+async def upload_data_file(
+    data_type: str,
+    file: UploadFile = File(...),
+    mode: str = Query("replace", description="replace(전체 교체) 또는 append(id 기준 추가/변경분 병합)")
+):
     """데이터 파일 업로드"""
     try:
         # data_type 검증
         if data_type not in ["preprocessed", "labeled"]:
             raise HTTPException(status_code=400, detail="Invalid data_type. Use 'preprocessed' or 'labeled'")
 
+        if mode not in ["replace", "append"]:
+            raise HTTPException(status_code=400, detail="Invalid mode. Use 'replace' or 'append'")
+
         # 파일 확장자 확인
         if not file.filename.endswith('.csv'):
             raise HTTPException(status_code=400, detail="Only CSV files are allowed")
 
-        # 데이터 디렉토리 생성
-        data_dir = Path("/app/data/final") if Path("/app").exists() else Path("../../data/final")
-        data_dir.mkdir(parents=True, exist_ok=True)
-
-        # 파일 경로 설정
-        if data_type == "preprocessed":
-            file_path = data_dir / "preprocessed_data.csv"
+        # 파일 저장 (기존 데이터가 없으면 append도 전체 저장으로 처리)
+        content = await file.read()
+        file_path = get_data_path(data_type)
+        result = {"mode": mode}
+        if mode == "append" and file_path.exists():
+            result.update(await run_in_threadpool(append_data, data_type, content))
         else:
-            file_path = data_dir / "labeled_data.csv"
-
-        # 파일 저장
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+            result["dataset_version"] = await run_in_threadpool(replace_data, data_type, content)
 
         # 저장된 파일 확인
         file_size = file_path.stat().st_size
@@ -765,9 +2230,14 @@ async def upload_data_file(data_type: str, file: UploadFile = File(...)):
             "message": f"{data_type} 데이터 파일이 성공적으로 업로드되었습니다.",
             "file_path": str(file_path),
             "file_size": file_size,
-            "file_size_mb": round(file_size / 1024 / 1024, 2)
+            "file_size_mb": round(file_size / 1024 / 1024, 2),
+            **result
         })
 
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -0,0 +1,32 @@
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+@pytest.fixture
+def data_env(tmp_path, monkeypatch):
+    """임시 디렉터리를 데이터/검수 결과 경로로 사용하고 메모리 캐시를 비움"""
+    data_dir = tmp_path / "data"
+    (data_dir / "final").mkdir(parents=True)
+    inspection_dir = tmp_path / "inspection_results"
+    inspection_dir.mkdir()
+
+    monkeypatch.setattr(main, "DATA_DIR", data_dir)
+    monkeypatch.setattr(main, "PREPROCESSED_DATA_PATH", data_dir / "final" / "preprocessed_data.csv")
+    monkeypatch.setattr(main, "LABELED_DATA_PATH", data_dir / "final" / "labeled_data.csv")
+    monkeypatch.setattr(main, "VERSIONS_DIR", data_dir / "versions")
+    monkeypatch.setattr(main, "INDEX_DIR", data_dir / "index")
+    monkeypatch.setattr(main, "SEGMENTS_DIR", data_dir / "index" / "segments")
+    monkeypatch.setattr(main, "INSPECTION_DIR", inspection_dir)
+    monkeypatch.setattr(main, "INSPECTION_TABLE_DIR", inspection_dir / "inspection_table")
+    monkeypatch.setattr(main, "_current_versions", {})
+    monkeypatch.setattr(main, "_dataset_cache", OrderedDict())
+    monkeypatch.setattr(main, "_dataset_stats_cache", {})
+    monkeypatch.setattr(main, "_search_index_cache", {})
+    return data_dir
@@ -0,0 +1,135 @@
+"""증분 갱신(추가 업로드) 결과가 전체 재계산과 일치하는지 검증"""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+
+WORDS = ["삼성 갤럭시 신제품", "아이폰 배터리", "다이어트 보조제 광고", "여행 추천", "주식 투자 방법"]
+QUERIES = ["갤럭시", "배터리 교체", "답변입니다", "다", "품", "광", "수정", "추가 질문", "없는검색어"]
+
+
+def make_labeled(ids):
+    ids = np.asarray(ids)
+    return pd.DataFrame({
+        "id": ids,
+        "question": [f"{WORDS[i % 5]} 질문 {i}" for i in ids],
+        "answer": [f"답변입니다 {WORDS[(i * 3) % 5]} 관련 내용 {i}" for i in ids],
+        "is_ad": ids % 5 == 0,
+        "is_fake": ids % 7 == 0,
+        "similar_id_1": (ids * 13) % 500 + 1,
+        "similar_id_1_score": (ids % 10) / 10,
+    })
+
+
+def to_csv_bytes(df):
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    return buffer.getvalue().encode("utf-8")
+
+
+def assert_stats_equal(actual, expected):
+    assert actual["row_count"] == expected["row_count"]
+    assert actual["columns"] == expected["columns"]
+    assert main.stats_dtype_names(actual["dtypes"]) == main.stats_dtype_names(expected["dtypes"])
+    np.testing.assert_array_equal(actual["missing_counts"], expected["missing_counts"])
+    np.testing.assert_allclose(actual["label_sums"], expected["label_sums"])
+    np.testing.assert_array_equal(actual["hash_values"], expected["hash_values"])
+    np.testing.assert_array_equal(actual["hash_counts"], expected["hash_counts"])
+
+
+def search_scores(index, query):
+    docs, scores = main.search_documents(index, query)
+    return dict(zip(index["ids"][docs].tolist(), scores.tolist()))
+
+
+@pytest.mark.parametrize("delta", [
+    # 기존 id 변경 (일부 컬럼만 포함)
+    pd.DataFrame({"id": [1, 2, 3], "answer": ["수정된 답변", "수정된 답변", "수정된 답변"]}),
+    # 신규 id 추가 (일부 컬럼만 포함)
+    pd.DataFrame({"id": [5000, 5001], "question": ["추가 질문", "추가 질문"]}),
+    # 변경 + 신규 + 중복 행
+    pd.DataFrame({
+        "id": [4, 4, 5002],
+        "question": ["중복 질문", "수정된 질문", "추가 질문"],
+        "is_ad": [True, True, False],
+    }),
+])
+def test_append_stats_match_full_recompute(data_env, delta):
+    base = make_labeled(range(1, 301))
+    main.replace_data("labeled", to_csv_bytes(base))
+
+    result = main.append_data("labeled", to_csv_bytes(delta))
+    version = result["dataset_version"]
+    merged = main.load_data("labeled", version)
+
+    # 메모리의 병합 결과와 증분 통계가 전체 재계산과 일치
+    assert_stats_equal(main.get_dataset_stats("labeled", version), main.compute_dataset_stats(merged))
+
+    # 저장된 파일을 다시 읽어도 품질 지표는 동일
+    main._dataset_cache.clear()
+    main._dataset_stats_cache.clear()
+    reloaded = main.load_data("labeled", version)
+    assert main.get_dataset_metrics("labeled", version) == main.metrics_from_stats(
+        main.compute_dataset_stats(reloaded), "labeled"
+    )
+
+    # 변경하지 않은 컬럼과 다른 행은 기존 값 유지
+    reloaded = reloaded.set_index("id")
+    expected = base.set_index("id")
+    untouched = expected.index.difference(delta["id"])
+    pd.testing.assert_frame_equal(
+        reloaded.loc[untouched, expected.columns], expected.loc[untouched], check_dtype=False
+    )
+    for item_id in set(delta["id"]) & set(expected.index):
+        row = delta[delta["id"] == item_id].iloc[-1]
+        for col in expected.columns:
+            want = row[col] if col in delta.columns else expected.loc[item_id, col]
+            assert reloaded.loc[item_id, col] == want
+
+
+def test_append_keeps_untouched_rows_in_file(data_env, monkeypatch):
+    base = make_labeled(range(1, 101))
+    main.replace_data("labeled", to_csv_bytes(base))
+    before = main.get_version_path("labeled", main.get_current_version("labeled")).read_text(encoding="utf-8")
+
+    # 결측이 생겨도 타입이 유지되어 전체 재계산 없이 변경분만 통계에 반영
+    computed_sizes = []
+    compute_dataset_stats = main.compute_dataset_stats
+    monkeypatch.setattr(main, "compute_dataset_stats", lambda df: computed_sizes.append(len(df)) or compute_dataset_stats(df))
+
+    delta = pd.DataFrame({"id": [1, 2, 5000], "answer": ["수정", "수정", "신규"]})
+    version = main.append_data("labeled", to_csv_bytes(delta))["dataset_version"]
+    assert max(computed_sizes) == 3
+    after = main.get_version_path("labeled", version).read_text(encoding="utf-8")
+
+    # 정수/불리언 컬럼이 528.0, 0.0 형태로 바뀌지 않음
+    before_lines = before.splitlines()
+    after_lines = after.splitlines()
+    assert after_lines[0] == before_lines[0]
+    assert after_lines[3:len(before_lines)] == before_lines[3:]
+    assert after_lines[-1] == "5000,,신규,,,,"
+
+
+def test_search_segments_match_rebuild(data_env):
+    main.replace_data("labeled", to_csv_bytes(make_labeled(range(1, 201))))
+
+    # 세그먼트가 SEARCH_MAX_SEGMENTS를 넘도록 변경/신규 행을 반복 추가
+    for step in range(main.SEARCH_MAX_SEGMENTS + 2):
+        delta = pd.DataFrame({
+            "id": [step * 10 + 1, step * 10 + 2, 1000 + step],
+            "question": [f"수정된 질문 {step}", "품질 검수", f"추가 질문 {step}"],
+        })
+        version = main.append_data("labeled", to_csv_bytes(delta))["dataset_version"]
+        index = main.load_search_index("labeled", version)
+        assert len(index["segments"]) <= main.SEARCH_MAX_SEGMENTS
+
+        merged = main.load_data("labeled", version)
+        rebuilt = main._assemble_search_index(version, [main._build_segment(merged)], [None])
+        for query in QUERIES:
+            incremental, full = search_scores(index, query), search_scores(rebuilt, query)
+            assert incremental.keys() == full.keys()
+            for item_id, score in full.items():
+                assert incremental[item_id] == pytest.approx(score)
@@ -0,0 +1,50 @@
+"""데이터셋 버전 등록/교체 업로드 실패 시 현재 버전 유지 검증"""
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import main
+from test_incremental import make_labeled, search_scores, to_csv_bytes
+
+
+def test_concurrent_first_registration(data_env):
+    make_labeled(np.arange(20000)).to_csv(main.LABELED_DATA_PATH, index=False)
+
+    versions, errors = [], []
+
+    def register():
+        try:
+            versions.append(main.get_current_version("labeled"))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=register) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(versions)) == 1
+    assert {p.name for p in main.VERSIONS_DIR.iterdir()} == {f"labeled_{versions[0]}.csv", "labeled_current.json"}
+
+
+@pytest.mark.parametrize("content", [
+    to_csv_bytes(pd.DataFrame({"question": ["갤럭시 질문"], "answer": ["답변"]})),
+    to_csv_bytes(pd.DataFrame({"id": [1, None], "question": ["갤럭시 질문", "갤럭시 질문"]})),
+    b"",
+])
+def test_failed_replace_keeps_current_version(data_env, content):
+    version = main.replace_data("labeled", to_csv_bytes(make_labeled(np.arange(100))))
+    expected = search_scores(main.load_search_index("labeled"), "갤럭시")
+
+    with pytest.raises(ValueError):
+        main.replace_data("labeled", content)
+
+    main._current_versions.clear()
+    assert main.get_current_version("labeled") == version
+    assert len(main.load_data("labeled")) == 100
+    assert search_scores(main.load_search_index("labeled"), "갤럭시") == expected
+    assert [info["version"] for info in main.list_dataset_versions("labeled")] == [version]
@@ -17,6 +17,12 @@ export const api = {
   // 품질 지표
   getQualityMetrics: (dataType) => apiClient.get(`/api/data/metrics/${dataType}`),
 
+  // 데이터셋 버전 목록
+  getDatasetVersions: (dataType) => apiClient.get(`/api/data/versions/${dataType}`),
+
+  // 질문/답변 검색
+  searchData: (dataType, params) => apiClient.get(`/api/search/${dataType}`, { params }),
+
   // 샘플링
   createSample: (params) => apiClient.get('/api/sampling/create', { params }),
 
@@ -32,9 +38,17 @@ export const api = {
   // 검수 결과 조회
   getInspectionResult: (sessionId) => apiClient.get(`/api/inspection/result/${sessionId}`),
 
+  // 검수 결과 내보내기 (다운로드 URL)
+  getSessionExportUrl: (sessionId, format = 'csv') =>
+    `${API_BASE_URL}/api/export/session/${encodeURIComponent(sessionId)}?format=${format}`,
+  getReportExportUrl: (format = 'csv') => `${API_BASE_URL}/api/export/report?format=${format}`,
+
   // 리포트
   getReportSummary: () => apiClient.get('/api/report/summary'),
 
+  // 검수 결과 분석
+  getInspectionAnalytics: (dataType) => apiClient.get('/api/analytics/inspections', { params: { data_type: dataType } }),
+
   // AI 배치 검수
   batchInspect: (data) => apiClient.post('/api/ai/batch-inspect', data),
 }
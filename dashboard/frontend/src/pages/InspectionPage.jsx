@@ -12,6 +12,7 @@ function InspectionPage() {
   const [inspections, setInspections] = useState([])
   const [loading, setLoading] = useState(true)
   const [saving, setSaving] = useState(false)
+  const [revision, setRevision] = useState(0)
 
   useEffect(() => {
     loadSession()
@@ -23,6 +24,7 @@ function InspectionPage() {
 
       setSampleData(response.data.sample_data)
       setSimilarItems(response.data.similar_items || {})
+      setRevision(response.data.result_revision || 0)
 
       const initialInspections = response.data.sample_data.map((item, idx) => {
         const similarityChecks = []
@@ -112,15 +114,21 @@ function InspectionPage() {
         answer: sampleData[idx]?.answer || ''
       }))
 
-      await api.saveInspectionResult({
+      const response = await api.saveInspectionResult({
         session_id: sessionId,
-        inspections: inspectionsWithData
+        inspections: inspectionsWithData,
+        revision
       })
+      setRevision(response.data.revision)
       alert('검수 결과가 저장되었습니다.')
       navigate('/report')
     } catch (error) {
       console.error('저장 실패:', error)
-      alert('저장에 실패했습니다.')
+      if (error.response?.status === 409) {
+        alert('다른 사용자가 먼저 이 세션의 검수 결과를 저장했습니다. 세션을 다시 불러온 뒤 저장해주세요.')
+      } else {
+        alert('저장에 실패했습니다.')
+      }
     } finally {
       setSaving(false)
     }
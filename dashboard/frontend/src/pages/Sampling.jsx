@@ -61,6 +61,7 @@ function Sampling() {
     try {
       const response = await api.batchInspect({
         session_id: result.session_id,
+        revision: result.result_revision ?? 0,
       });
 
       if (response.data.success) {
@@ -75,7 +76,9 @@ function Sampling() {
       }
     } catch (error) {
       console.error("AI 검수 실패:", error);
-      if (error.response?.status === 503) {
+      if (error.response?.status === 409) {
+        alert("다른 사용자가 이미 이 세션의 검수 결과를 저장했습니다.\n\n리포트에서 저장된 결과를 확인해주세요.");
+      } else if (error.response?.status === 503) {
         alert(
           "OpenAI API 키가 설정되지 않았습니다.\n\n백엔드 디렉토리에 .env 파일을 생성하고 OPENAI_API_KEY를 추가해주세요."
         );